@@ -1,14 +1,8 @@
 # -*- coding: utf-8 -*-
-from typing import TYPE_CHECKING
-
-import ipyflow.api
-from ipyflow import singletons
-from ipyflow.api import *  # noqa: F403
-from ipyflow.kernel.kernel import IPyflowKernel, UsesIPyflowKernel
-from ipyflow.shell import load_ipython_extension as load_ipyflow_extension, unload_ipython_extension as unload_ipyflow_extension
-from ipyflow.models import cell_above, cell_below, cell_at_offset, cells, last_run_cell, namespaces, scopes, statements, symbols, timestamps
-from ipyflow.singletons import flow, kernel, shell, tracer
-from ipyflow.tracing.uninstrument import uninstrument
+import importlib
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 from . import _version
 __version__ = _version.get_versions()['version']
@@ -16,6 +10,97 @@ __version__ = _version.get_versions()['version']
 if TYPE_CHECKING:
     from IPython import InteractiveShell
 
+    import ipyflow.api  # noqa: F401
+    from ipyflow import singletons  # noqa: F401
+    from ipyflow.api import *  # noqa: F403
+    from ipyflow.kernel.kernel import IPyflowKernel, UsesIPyflowKernel  # noqa: F401
+    from ipyflow.shell import load_ipython_extension as load_ipyflow_extension, unload_ipython_extension as unload_ipyflow_extension  # noqa: F401
+    from ipyflow.models import cell_above, cell_below, cell_at_offset, cells, last_run_cell, namespaces, scopes, statements, symbols, timestamps
+    from ipyflow.singletons import flow, kernel, shell, tracer
+    from ipyflow.tracing.uninstrument import uninstrument
+
+
+# keep in sync with ipyflow.api.__all__; listed statically so that
+# `from ipyflow import *` does not need to import the api eagerly
+_API_NAMES = (
+    "code",
+    "deps",
+    "has_tag",
+    "lift",
+    "rdeps",
+    "reproduce_cell",
+    "rusers",
+    "set_tag",
+    "stderr",
+    "stdout",
+    "timestamp",
+    "unset_tag",
+    "users",
+    "watchpoints",
+)
+
+
+# attributes resolved on first access (PEP 562) so that merely importing
+# ipyflow (e.g. during jupyter server extension discovery) stays cheap;
+# maps name -> (module, attribute within module or None for the module itself)
+_LAZY_ATTRS: Dict[str, Tuple[str, Optional[str]]] = {
+    "api": ("ipyflow.api", None),
+    "singletons": ("ipyflow.singletons", None),
+    "IPyflowKernel": ("ipyflow.kernel.kernel", "IPyflowKernel"),
+    "UsesIPyflowKernel": ("ipyflow.kernel.kernel", "UsesIPyflowKernel"),
+    "load_ipyflow_extension": ("ipyflow.shell", "load_ipython_extension"),
+    "unload_ipyflow_extension": ("ipyflow.shell", "unload_ipython_extension"),
+    "flow": ("ipyflow.singletons", "flow"),
+    "kernel": ("ipyflow.singletons", "kernel"),
+    "shell": ("ipyflow.singletons", "shell"),
+    "tracer": ("ipyflow.singletons", "tracer"),
+    "uninstrument": ("ipyflow.tracing.uninstrument", "uninstrument"),
+    **{
+        name: ("ipyflow.models", name)
+        for name in (
+            "cell_above",
+            "cell_below",
+            "cell_at_offset",
+            "cells",
+            "last_run_cell",
+            "namespaces",
+            "scopes",
+            "statements",
+            "symbols",
+            "timestamps",
+        )
+    },
+    **{name: ("ipyflow.api", name) for name in _API_NAMES},
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name)
+    ret = module if attr is None else getattr(module, attr)
+    globals()[name] = ret
+    return ret
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+class _IPyflowModule(ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # the import system binds the ipyflow.flow, ipyflow.kernel, and ipyflow.shell
+        # submodules onto this module when they are first loaded; keep exposing the
+        # singleton accessors of the same name instead, as eager importing used to
+        if name in ("flow", "kernel", "shell") and isinstance(value, ModuleType):
+            value = getattr(importlib.import_module("ipyflow.singletons"), name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _IPyflowModule
+
 
 def _jupyter_server_extension_paths():
     return [{"module": "ipyflow"}]
@@ -32,6 +117,12 @@ def load_jupyter_server_extension(nbapp):
 
 
 def load_ipython_extension(ipy: "InteractiveShell", do_asyncio_patches: bool = False) -> None:
+    from ipyflow import singletons
+    from ipyflow.kernel.kernel import IPyflowKernel, UsesIPyflowKernel
+    from ipyflow.shell import load_ipython_extension as load_ipyflow_extension
+    from ipyflow.utils.gc_utils import set_gc_thresholds
+
+    set_gc_thresholds()
     load_ipyflow_extension(ipy)
     kernel = getattr(ipy, "kernel", None)
     if kernel is None:
@@ -54,6 +145,9 @@ def load_ipython_extension(ipy: "InteractiveShell", do_asyncio_patches: bool = F
 
 
 def unload_ipython_extension(ipy: "InteractiveShell") -> None:
+    from ipyflow.kernel.kernel import IPyflowKernel
+    from ipyflow.shell import unload_ipython_extension as unload_ipyflow_extension
+
     unload_ipyflow_extension(ipy)
     kernel = getattr(ipy, "kernel", None)
     if kernel is None:
@@ -69,7 +163,7 @@ def unload_ipython_extension(ipy: "InteractiveShell") -> None:
         IPyflowKernel.client_comm.send({"type": "unestablish", "success": True})  # type: ignore
 
 
-__all__ = ipyflow.api.__all__ + [
+__all__ = list(_API_NAMES) + [
     "__version__",
     "cell_above",
     "cell_below",
@@ -101,5 +195,7 @@ def main():
     from IPython.terminal import ipapp as app
 
     from ipyflow.shell import IPyflowTerminalInteractiveShell
+    from ipyflow.utils.gc_utils import set_gc_thresholds
 
+    set_gc_thresholds()
     app.launch_new_instance(interactive_shell_class=IPyflowTerminalInteractiveShell)
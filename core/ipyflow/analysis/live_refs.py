@@ -26,7 +26,7 @@ from ipyflow.analysis.resolved_symbols import ResolvedSymbol
 from ipyflow.analysis.symbol_ref import Atom, LiveSymbolRef, SymbolRef, visit_stack
 from ipyflow.config import FlowDirection
 from ipyflow.data_model.timestamp import Timestamp
-from ipyflow.singletons import flow, tracer
+from ipyflow.singletons import flow
 
 if TYPE_CHECKING:
     from ipyflow.data_model.scope import Scope
@@ -37,6 +37,8 @@ logger.setLevel(logging.ERROR)
 
 
 _RESOLVER_EXCEPTIONS = ("get_ipython", "run_line_magic", "run_cell_magic")
+# expression contexts carry no state, so synthesized nodes can share one
+_STORE_CTX = ast.Store()
 
 
 def _chain_root(node: ast.AST):
@@ -237,7 +239,7 @@ class ComputeLiveSymbolRefs(
             # TODO: check __all__ if possible for this case
             if name.name == "*":
                 continue
-            targets.append(ast.Name(id=name.asname or name.name, ctx=ast.Store()))
+            targets.append(ast.Name(id=name.asname or name.name, ctx=_STORE_CTX))
         self.visit_Assign_impl(targets, value=None)
 
     visit_Import = visit_ImportFrom = visit_import
@@ -285,8 +287,6 @@ class ComputeLiveSymbolRefs(
             is_killed = ref in self.dead
             if is_killed and not self._include_killed_live:
                 return
-            if id(node) in tracer().reactive_node_ids:
-                ref.chain[0].is_reactive = True
             self.live.add(
                 LiveSymbolRef(
                     ref,
@@ -480,7 +480,7 @@ def get_live_symbols_and_cells_for_references(
         if len(chain) >= 1:
             atom = chain[0].value
             did_resolve = isinstance(atom, str) and (
-                hasattr(builtins, atom) or atom in _RESOLVER_EXCEPTIONS
+                atom in builtins.__dict__ or atom in _RESOLVER_EXCEPTIONS
             )
         else:
             did_resolve = False
@@ -559,7 +559,7 @@ def _compute_call_chain_live_symbols_and_cells(
                 atom = chain[0].value
                 did_resolve = isinstance(atom, str) and (
                     atom in init_killed
-                    or hasattr(builtins, atom)
+                    or atom in builtins.__dict__
                     or atom in _RESOLVER_EXCEPTIONS
                 )
             else:
@@ -576,13 +576,22 @@ def _compute_call_chain_live_symbols_and_cells(
                 ):
                     continue
                 # FIXME: kind of hacky
-                resolved.atom.is_cascading_reactive = (
-                    resolved.atom.is_cascading_reactive
-                    or called_sym.is_cascading_reactive
-                )
-                resolved.atom.is_reactive = (
-                    resolved.atom.is_reactive or called_sym.is_reactive
-                )
+                resolved_atom = resolved.atom
+                if (called_sym.is_reactive and not resolved_atom.is_reactive) or (
+                    called_sym.is_cascading_reactive
+                    and not resolved_atom.is_cascading_reactive
+                ):
+                    # atoms are immutable (their hash is precomputed), so swap in a new
+                    # one; unlike Atom.reactive(), this must preserve is_blocking
+                    resolved.atom = Atom(
+                        resolved_atom.value,
+                        is_callpoint=resolved_atom.is_callpoint,
+                        is_subscript=resolved_atom.is_subscript,
+                        is_reactive=resolved_atom.is_reactive or called_sym.is_reactive,
+                        is_cascading_reactive=resolved_atom.is_cascading_reactive
+                        or called_sym.is_cascading_reactive,
+                        is_blocking=resolved_atom.is_blocking,
+                    )
                 did_resolve = True
                 if resolved.is_called:
                     worklist.append((resolved, stmt_ctr))
@@ -13,7 +13,11 @@ class SkipUnboundArgsMixin(ast.NodeVisitor):
 
 class VisitListsMixin(ast.NodeVisitor):
     def generic_visit(self, node: Union[ast.AST, Sequence[ast.AST]]) -> None:
-        if node is None:
+        # AST nodes are by far the common case; test for them before falling back
+        # to the (much slower) abc-based Sequence check
+        if isinstance(node, ast.AST):
+            super().generic_visit(node)
+        elif node is None:
             return
         elif isinstance(node, Sequence):
             for item in node:
@@ -1,24 +1,28 @@
 # -*- coding: utf-8 -*-
 import ast
 import logging
+import operator
+import sys
 from typing import (
     TYPE_CHECKING,
+    AbstractSet,
     Any,
+    Callable,
+    Dict,
     Generator,
     Iterable,
     List,
     Optional,
     Sequence,
     Tuple,
+    Type,
     Union,
-    cast,
 )
 
 from ipyflow.analysis.resolved_symbols import ResolvedSymbol
 from ipyflow.data_model.timestamp import Timestamp
 from ipyflow.singletons import flow, tracer
 from ipyflow.types import SubscriptIndices, SupportedIndexType
-from ipyflow.utils import CommonEqualityMixin
 from ipyflow.utils.ast_utils import AstRange, subscript_to_slice
 
 if TYPE_CHECKING:
@@ -29,6 +33,42 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
 
 
+if sys.version_info >= (3, 8):
+    _CONSTANT_TYPES: Tuple[Type[ast.AST], ...] = (ast.Constant,)
+    _constant_value: Callable[[ast.AST], Any] = operator.attrgetter("value")
+    _scalar_constant_value = _constant_value
+else:  # pragma: no cover
+    _CONSTANT_TYPES = (ast.Constant, ast.Num, ast.Str)
+
+    def _constant_value(node: ast.AST) -> Any:
+        if isinstance(node, ast.Num):
+            return node.n
+        elif isinstance(node, ast.Str):
+            return node.s
+        else:
+            return node.value  # type: ignore
+
+    def _scalar_constant_value(node: ast.AST) -> Any:
+        # only int literals are supported as standalone numeric indices
+        if isinstance(node, ast.Num) and not isinstance(node.n, int):
+            return None
+        return _constant_value(node)
+
+
+if sys.version_info >= (3, 9):
+
+    def _is_legacy_constant_index(slc: ast.AST) -> bool:
+        # ast.Index is no longer produced by the parser
+        return False
+
+else:  # pragma: no cover
+
+    def _is_legacy_constant_index(slc: ast.AST) -> bool:
+        return isinstance(slc, ast.Index) and isinstance(
+            slc.value, (ast.Str, ast.Num)  # type: ignore
+        )
+
+
 def resolve_slice_to_constant(
     node: ast.Subscript,
 ) -> Optional[Union[SupportedIndexType, ast.Name]]:
@@ -38,17 +78,8 @@ def resolve_slice_to_constant(
     slc = subscript_to_slice(node)
 
     if isinstance(slc, ast.Tuple):
-        elts: Any = []
-        for v in slc.elts:
-            if isinstance(v, ast.Num):
-                elts.append(v.n)
-            elif isinstance(v, ast.Str):
-                elts.append(v.s)
-            elif isinstance(v, ast.Constant):
-                elts.append(v.value)
-            else:
-                return None
-        return tuple(elts)  # type: ignore
+        elts = [_constant_value(v) for v in slc.elts if isinstance(v, _CONSTANT_TYPES)]
+        return tuple(elts) if len(elts) == len(slc.elts) else None  # type: ignore
 
     negate = False
     if isinstance(slc, ast.UnaryOp) and isinstance(slc.op, ast.USub):
@@ -58,26 +89,26 @@ def resolve_slice_to_constant(
     if isinstance(slc, ast.Name):
         return slc
 
-    if not isinstance(slc, (ast.Constant, ast.Str, ast.Num)):
-        return None
-
-    if isinstance(slc, ast.Constant):
-        slc = slc.value
-    elif isinstance(slc, ast.Num):  # pragma: no cover
-        slc = slc.n  # type: ignore
-        if not isinstance(slc, int):
-            return None
-    elif isinstance(slc, ast.Str):  # pragma: no cover
-        slc = slc.s  # type: ignore
-    else:
+    if not isinstance(slc, _CONSTANT_TYPES):
         return None
 
+    slc = _scalar_constant_value(slc)
     if isinstance(slc, int) and negate:
         slc = -slc  # type: ignore
     return slc  # type: ignore
 
 
-class Atom(CommonEqualityMixin):
+class Atom:
+    __slots__ = (
+        "value",
+        "is_callpoint",
+        "is_subscript",
+        "is_reactive",
+        "is_cascading_reactive",
+        "is_blocking",
+        "_hash",
+    )
+
     def __init__(
         self,
         value: SupportedIndexType,
@@ -87,12 +118,27 @@ class Atom(CommonEqualityMixin):
         is_cascading_reactive: bool = False,
         is_blocking: bool = False,
     ) -> None:
+        if type(value) is str:
+            # identifiers repeat heavily across cells; interning makes
+            # hashing and equality checks on them cheaper
+            value = sys.intern(value)
         self.value = value
         self.is_callpoint = is_callpoint
         self.is_subscript = is_subscript
         self.is_reactive = is_reactive
         self.is_cascading_reactive = is_cascading_reactive
         self.is_blocking = is_blocking
+        # atoms are treated as immutable, so the hash can be computed up front
+        self._hash = hash(
+            (
+                value,
+                is_callpoint,
+                is_subscript,
+                is_reactive,
+                is_cascading_reactive,
+                is_blocking,
+            )
+        )
 
     def nonreactive(self) -> "Atom":
         return self.__class__(
@@ -135,15 +181,20 @@ class Atom(CommonEqualityMixin):
         )
 
     def __hash__(self) -> int:
-        return hash(
-            (
-                self.value,
-                self.is_callpoint,
-                self.is_subscript,
-                self.is_reactive,
-                self.is_cascading_reactive,
-                self.is_blocking,
-            )
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        return (
+            isinstance(other, Atom)
+            and self._hash == other._hash
+            and self.value == other.value
+            and self.is_callpoint == other.is_callpoint
+            and self.is_subscript == other.is_subscript
+            and self.is_reactive == other.is_reactive
+            and self.is_cascading_reactive == other.is_cascading_reactive
+            and self.is_blocking == other.is_blocking
         )
 
     def __repr__(self) -> str:
@@ -153,10 +204,17 @@ class Atom(CommonEqualityMixin):
         return str(self.value) + ("(...)" if self.is_callpoint else "")
 
 
+# shared placeholder for the node id sets between compute_chain calls
+_NO_NODE_IDS: AbstractSet[int] = frozenset()
+
+
 class SymbolRefVisitor(ast.NodeVisitor):
     def __init__(self) -> None:
         self.symbol_chain: List[Atom] = []
         self.scope: Optional["Scope"] = None
+        self._reactive_node_ids: AbstractSet[int] = _NO_NODE_IDS
+        self._cascading_reactive_node_ids: AbstractSet[int] = _NO_NODE_IDS
+        self._blocking_node_ids: AbstractSet[int] = _NO_NODE_IDS
 
     def __call__(
         self,
@@ -173,13 +231,42 @@ class SymbolRefVisitor(ast.NodeVisitor):
         ],
         scope: Optional["Scope"] = None,
     ) -> "SymbolRef":
+        return SymbolRef(self.compute_chain(node, scope=scope), scope=scope)
+
+    def compute_chain(
+        self,
+        node: Union[
+            ast.Attribute,
+            ast.Subscript,
+            ast.Call,
+            ast.Name,
+            ast.ClassDef,
+            ast.FunctionDef,
+            ast.AsyncFunctionDef,
+            ast.Import,
+            ast.ImportFrom,
+        ],
+        scope: Optional["Scope"] = None,
+    ) -> List[Atom]:
+        """
+        Computes the atoms for the chain rooted at `node`. Each visitor
+        recurses into the value of an attribute / subscript / call before
+        appending its own atom, so the chain comes out already in order.
+        """
         self.scope = scope
+        tracer_ = tracer()
+        self._reactive_node_ids = tracer_.reactive_node_ids
+        self._cascading_reactive_node_ids = tracer_.cascading_reactive_node_ids
+        self._blocking_node_ids = tracer_.blocking_node_ids
         try:
             self.visit(node)
         except ValueError:
             self.symbol_chain.clear()
-        self.symbol_chain.reverse()
-        ret = SymbolRef(self.symbol_chain, scope=scope)
+        finally:
+            self._reactive_node_ids = _NO_NODE_IDS
+            self._cascading_reactive_node_ids = _NO_NODE_IDS
+            self._blocking_node_ids = _NO_NODE_IDS
+        ret = self.symbol_chain
         self.symbol_chain = []
         self.scope = None
         return ret
@@ -198,33 +285,32 @@ class SymbolRefVisitor(ast.NodeVisitor):
         val: str,
         **kwargs,
     ) -> None:
+        node_id = id(node)
         self.symbol_chain.append(
             Atom(
                 val,
-                is_reactive=id(node) in tracer().reactive_node_ids,
-                is_cascading_reactive=id(node) in tracer().cascading_reactive_node_ids,
-                is_blocking=id(node) in tracer().blocking_node_ids,
+                is_reactive=node_id in self._reactive_node_ids,
+                is_cascading_reactive=node_id in self._cascading_reactive_node_ids,
+                is_blocking=node_id in self._blocking_node_ids,
                 **kwargs,
             )
         )
 
     def visit_Call(self, node: ast.Call) -> None:
         if isinstance(node.func, ast.Attribute):
-            self._append_atom(node.func, node.func.attr, is_callpoint=True)
             self.visit(node.func.value)
+            self._append_atom(node.func, node.func.attr, is_callpoint=True)
         elif isinstance(node.func, ast.Subscript):
-            if isinstance(node.func.slice, ast.Constant) or (
-                isinstance(node.func.slice, ast.Index)
-                and isinstance(node.func.slice.value, (ast.Str, ast.Num))  # type: ignore
+            self.visit(node.func.value)
+            if isinstance(node.func.slice, ast.Constant) or _is_legacy_constant_index(
+                node.func.slice
             ):
                 sliceval = resolve_slice_to_constant(node.func)
                 self.symbol_chain.append(
                     Atom(str(sliceval), is_callpoint=True, is_subscript=True)
                 )
-            self.visit(node.func.value)
         elif isinstance(node.func, ast.Name):
-            self.visit(node.func)
-            self.symbol_chain[-1].is_callpoint = True
+            self._append_atom(node.func, node.func.id, is_callpoint=True)
         elif isinstance(node.func, ast.Call):
             # TODO: handle this case too, e.g. f.g()().h
             pass
@@ -238,10 +324,11 @@ class SymbolRefVisitor(ast.NodeVisitor):
             pass
 
     def visit_Attribute(self, node: ast.Attribute) -> None:
-        self._append_atom(node, node.attr)
         self.visit(node.value)
+        self._append_atom(node, node.attr)
 
     def visit_Subscript(self, node: ast.Subscript) -> None:
+        self.visit(node.value)
         resolved = resolve_slice_to_constant(node)
         if resolved is not None:
             if isinstance(resolved, ast.Name):
@@ -260,7 +347,6 @@ class SymbolRefVisitor(ast.NodeVisitor):
                         self.symbol_chain.append(Atom(sym.obj, is_subscript=True))
             else:
                 self.symbol_chain.append(Atom(resolved, is_subscript=True))
-        self.visit(node.value)
 
     def visit_Name(self, node: ast.Name) -> None:
         self._append_atom(node, node.id)
@@ -275,11 +361,12 @@ class SymbolRefVisitor(ast.NodeVisitor):
         self._append_atom(node, node.name)
 
     def visit_Import(self, node: ast.Import):
-        for name in node.names:
+        # names are emitted last-to-first, matching the original reversed chain
+        for name in reversed(node.names):
             self._append_atom(node, name.asname or name.name)
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
-        for name in node.names:
+        for name in reversed(node.names):
             self._append_atom(node, name.asname or name.name)
 
     def visit_Constant(self, node):
@@ -311,12 +398,47 @@ class SymbolRefVisitor(ast.NodeVisitor):
         # give up
         return
 
+    def visit(self, node: ast.AST) -> None:
+        # avoids the string concatenation + getattr that ast.NodeVisitor.visit
+        # does per node; see _SYMBOL_REF_VISITOR_BY_NODE_TYPE below
+        _SYMBOL_REF_VISITOR_BY_NODE_TYPE.get(type(node), _generic_visit)(self, node)
+
+
+def _make_symbol_ref_visitor_table() -> Dict[type, Callable[..., None]]:
+    table = {}
+    for attr, func in vars(SymbolRefVisitor).items():
+        if not attr.startswith("visit_"):
+            continue
+        # vars() rather than getattr() to avoid deprecation warnings for node
+        # types that newer Pythons no longer produce (e.g. ast.Num)
+        node_type = vars(ast).get(attr[len("visit_") :])
+        if isinstance(node_type, type):
+            table[node_type] = func
+    return table
+
+
+_generic_visit = SymbolRefVisitor.generic_visit
+_SYMBOL_REF_VISITOR_BY_NODE_TYPE = _make_symbol_ref_visitor_table()
+
 
 visit_stack: List[ast.AST] = []
 
 
+_SYMBOL_REF_NODE_TYPES = (
+    ast.Name,
+    ast.Attribute,
+    ast.Subscript,
+    ast.Call,
+    ast.ClassDef,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.Import,
+    ast.ImportFrom,
+)
+
+
 class SymbolRef:
-    _cached_symbol_ref_visitor = SymbolRefVisitor()
+    __slots__ = ("chain", "scope", "ast_range", "_hash")
 
     def __init__(
         self,
@@ -326,24 +448,11 @@ class SymbolRef:
     ) -> None:
         # FIXME: each symbol should distinguish between attribute and subscript
         # FIXME: bumped in priority 2021/09/07
-        if isinstance(
-            symbols,
-            (
-                ast.Name,
-                ast.Attribute,
-                ast.Subscript,
-                ast.Call,
-                ast.ClassDef,
-                ast.FunctionDef,
-                ast.AsyncFunctionDef,
-                ast.Import,
-                ast.ImportFrom,
-            ),
-        ):
+        if isinstance(symbols, _SYMBOL_REF_NODE_TYPES):
             ast_range = ast_range or AstRange.from_ast_node(
                 symbols if hasattr(symbols, "lineno") else visit_stack[-1]
             )
-            symbols = self._cached_symbol_ref_visitor(symbols, scope=scope).chain
+            symbols = SymbolRefVisitor().compute_chain(symbols, scope=scope)
         elif isinstance(symbols, ast.AST):  # pragma: no cover
             raise TypeError("unexpected type for %s" % symbols)
         elif isinstance(symbols, Atom):
@@ -351,6 +460,8 @@ class SymbolRef:
         self.chain: Tuple[Atom, ...] = tuple(symbols)
         self.scope: Optional["Scope"] = scope
         self.ast_range: Optional[AstRange] = ast_range
+        # intentionally omit self.scope and self.ast_range
+        self._hash: int = hash(self.chain)
 
     @classmethod
     def from_string(
@@ -380,12 +491,13 @@ class SymbolRef:
         return cls.from_string(symbol_str).to_symbol()
 
     def __hash__(self) -> int:
-        # intentionally omit self.scope
-        return hash(self.chain)
+        return self._hash
 
     def __eq__(self, other) -> bool:
         # intentionally omit self.scope
-        if not isinstance(other, SymbolRef):
+        if self is other:
+            return True
+        if not isinstance(other, SymbolRef) or self._hash != other._hash:
             return False
         if (
             self.ast_range is not None
@@ -433,17 +545,11 @@ class SymbolRef:
         cascading_reactive_seen = False
         blocking_seen = False
         if yield_in_reverse:
-            gen: Iterable[Tuple["Symbol", Atom, Atom]] = [
-                (resolved.sym, resolved.atom, resolved.next_atom)
-                for resolved in self.gen_resolved_symbols(
-                    scope,
-                    only_yield_final_symbol=only_yield_final_symbol,
-                    yield_all_intermediate_symbols=True,
-                    inherit_reactivity=False,
-                    yield_in_reverse=False,
-                )
-            ]
-            cast(list, gen).reverse()
+            # collect the raw triples directly rather than wrapping each one in a
+            # ResolvedSymbol only to unwrap it again before reversing
+            triples = list(scope.gen_symbols_for_attrsub_chain(self))
+            triples.reverse()
+            gen: Iterable[Tuple["Symbol", Atom, Optional[Atom]]] = triples
         else:
             gen = scope.gen_symbols_for_attrsub_chain(self)
         for sym, atom, next_atom in gen:
@@ -475,7 +581,9 @@ class SymbolRef:
                 yield ResolvedSymbol(sym, atom, next_atom)
 
 
-class LiveSymbolRef(CommonEqualityMixin):
+class LiveSymbolRef:
+    __slots__ = ("ref", "timestamp", "is_lhs_ref", "is_killed")
+
     def __init__(
         self,
         ref: SymbolRef,
@@ -503,6 +611,17 @@ class LiveSymbolRef(CommonEqualityMixin):
     def __hash__(self) -> int:
         return hash((self.ref, self.timestamp, self.is_lhs_ref))
 
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        return (
+            isinstance(other, LiveSymbolRef)
+            and self.timestamp == other.timestamp
+            and self.is_lhs_ref == other.is_lhs_ref
+            and self.is_killed == other.is_killed
+            and self.ref == other.ref
+        )
+
     def __str__(self) -> str:
         return (
             f"<live:{self.ref}@{self.timestamp}{' (lhs)' if self.is_lhs_ref else ''}>"
@@ -8,7 +8,7 @@ import logging
 import os
 import sys
 from types import ModuleType
-from typing import Dict, List, Optional, Set, Tuple, Type, Union
+from typing import Dict, List, Optional, Set, Tuple, Type
 
 from ipyflow.annotations.annotations import Mutate, UpsertSymbol
 from ipyflow.tracing.external_calls.base_handlers import (
@@ -30,6 +30,29 @@ REGISTERED_CLASS_SPECS: Dict[str, List[ast.ClassDef]] = {}
 REGISTERED_FUNCTION_SPECS: Dict[str, List[ast.FunctionDef]] = {}
 
 
+if sys.version_info >= (3, 8):
+
+    def _get_str_constant(node: ast.AST) -> Optional[str]:
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        return None
+
+    def _is_num_constant(node: ast.AST) -> bool:
+        return (
+            isinstance(node, ast.Constant)
+            and isinstance(node.value, (int, float, complex))
+            and not isinstance(node.value, bool)
+        )
+
+else:  # pragma: no cover
+
+    def _get_str_constant(node: ast.AST) -> Optional[str]:
+        return node.s if isinstance(node, ast.Str) else None
+
+    def _is_num_constant(node: ast.AST) -> bool:
+        return isinstance(node, ast.Num)
+
+
 @functools.lru_cache(maxsize=None)
 def _mutate_argument(
     pos: Optional[int], name: Optional[str], overwrite: bool = False
@@ -163,8 +186,9 @@ def get_names_for_function(func: ast.FunctionDef) -> List[str]:
         if not isinstance(deco_func, ast.Name) or deco_func.id != "handler_for":
             continue
         for arg in decorator.args:
-            if isinstance(arg, ast.Str):
-                names.append(arg.s)
+            name = _get_str_constant(arg)
+            if name is not None:
+                names.append(name)
     if len(names) > 0:
         return names
     else:
@@ -202,8 +226,9 @@ def get_modules_from_decorators(decorators: List[ast.expr]) -> Set[str]:
         ):
             continue
         for arg in decorator.args:
-            if isinstance(arg, ast.Str):
-                modules.append(arg.s)
+            module = _get_str_constant(arg)
+            if module is not None:
+                modules.append(module)
     return set(modules)
 
 
@@ -233,22 +258,20 @@ def compile_functions(
     return function_handlers
 
 
-def handle_string_annotation(
-    node: Union[ast.Expr, ast.Str], filename: str
-) -> Optional[Set[str]]:
-    if isinstance(node, ast.Expr):
-        if isinstance(node.value, ast.Str):
-            node = node.value
-        else:
-            return None
+def handle_string_annotation(node: ast.Expr, filename: str) -> Optional[Set[str]]:
+    annotation = _get_str_constant(node.value)
+    if annotation is None:
+        return None
     # validate that it's not too dangerous to call "eval" in the header
-    header, contents = node.s.split("\n", 1)
+    header, contents = annotation.split("\n", 1)
     header = header[1:]
     parsed_header = ast.parse(header, mode="eval").body
     if not isinstance(parsed_header, ast.Compare):
         return None
     for comparator in [parsed_header.left] + parsed_header.comparators:
-        if not isinstance(comparator, (ast.Attribute, ast.Tuple, ast.Num)):
+        if not isinstance(
+            comparator, (ast.Attribute, ast.Tuple)
+        ) and not _is_num_constant(comparator):
             return None
         if isinstance(comparator, ast.Attribute):
             if not isinstance(comparator.value, ast.Name):
@@ -259,7 +282,7 @@ def handle_string_annotation(
                 return None
         elif isinstance(comparator, ast.Tuple):
             for elt in comparator.elts:
-                if not isinstance(elt, ast.Num):
+                if not _is_num_constant(elt):
                     return None
     if eval(header):
         return register_annotations_from_source(contents, filename)
@@ -270,7 +293,7 @@ def handle_string_annotation(
 def register_annotations_from_source(source: str, filename: str) -> Set[str]:
     regisered_modules = set()
     for node in ast.parse(source).body:
-        if not isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.Expr, ast.Str)):
+        if not isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.Expr)):
             continue
         for module in get_modules_from_decorators(
             getattr(node, "decorator_list", [])
@@ -280,7 +303,7 @@ def register_annotations_from_source(source: str, filename: str) -> Set[str]:
                 REGISTERED_CLASS_SPECS.setdefault(module, []).append(node)
             elif isinstance(node, ast.FunctionDef):
                 REGISTERED_FUNCTION_SPECS.setdefault(module, []).append(node)
-            elif isinstance(node, (ast.Expr, ast.Str)):
+            elif isinstance(node, ast.Expr):
                 regisered_modules |= handle_string_annotation(node, filename) or set()
     return regisered_modules
 
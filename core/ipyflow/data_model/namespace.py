@@ -33,6 +33,8 @@ _override_unused_warning_namespaces = namespaces
 class Namespace(Scope):
     ANONYMOUS = "<anonymous_namespace>"
 
+    is_namespace_scope = True
+
     PENDING_CLASS_PLACEHOLDER = object()
 
     # special object for virtually representing the file system
@@ -64,14 +66,19 @@ class Namespace(Scope):
         self._subscript_symbol_by_name: Dict[SupportedIndexType, Symbol] = {}
         self.namespace_waiting_symbols: Set[Symbol] = set()
 
-    @property
-    def is_namespace_scope(self):
-        return True
-
     def __bool__(self) -> bool:
         # in order to override if __len__ returns 0
         return True
 
+    def __getitem__(self, item: SupportedIndexType) -> Symbol:
+        ret = self.get(item)
+        if ret is None:
+            raise KeyError("item not found: %s" % item)
+        return ret
+
+    def __contains__(self, item: SupportedIndexType) -> bool:
+        return self.get(item) is not None
+
     def __len__(self) -> int:
         if not isinstance(self.obj, (dict, list, tuple)):  # pragma: no cover
             raise TypeError(
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import ast
+import functools
 import itertools
 import logging
 import symtable
@@ -9,6 +10,7 @@ from typing import (
     Dict,
     Generator,
     Iterable,
+    List,
     Optional,
     Set,
     Tuple,
@@ -22,7 +24,7 @@ from ipyflow.analysis.live_refs import compute_live_dead_symbol_refs
 from ipyflow.analysis.symbol_ref import Atom, SymbolRef
 from ipyflow.data_model.symbol import Symbol, SymbolType
 from ipyflow.models import _ScopeContainer, cells, scopes
-from ipyflow.singletons import tracer, tracer_initialized
+from ipyflow.singletons import flow, tracer, tracer_initialized
 from ipyflow.types import SupportedIndexType
 
 if TYPE_CHECKING:
@@ -37,9 +39,23 @@ logger.setLevel(logging.WARNING)
 _override_unused_warning_scopes = scopes
 
 
+@functools.lru_cache(maxsize=4096)
+def _symbol_ref_from_name(name: str) -> SymbolRef:
+    # names repeat heavily across a notebook, and SymbolRefs
+    # are not mutated after construction, so share the parses
+    return SymbolRef.from_string(name)
+
+
 class Scope:
     GLOBAL_SCOPE_NAME = "<module>"
 
+    # a class attribute rather than a property since it is read on every
+    # step of a scope chain walk; Namespace overrides it
+    is_namespace_scope = False
+
+    # subclasses (e.g. Namespace) do not declare slots and so still get a __dict__
+    __slots__ = ("scope_name", "parent_scope", "symtab", "_symbol_by_name")
+
     def __init__(
         self,
         scope_name: str = GLOBAL_SCOPE_NAME,
@@ -61,13 +77,15 @@ class Scope:
         return str(self)
 
     def __getitem__(self, item: SupportedIndexType) -> Symbol:
-        ret = self.get(item)
-        if ret is None:
-            raise KeyError("item not found: %s" % item)
-        return ret
+        # plain scopes resolve names only via _symbol_by_name, so skip the
+        # polymorphic get(); subclasses with richer lookup override this
+        try:
+            return self._symbol_by_name[item]
+        except KeyError:
+            raise KeyError("item not found: %s" % item) from None
 
     def __contains__(self, item: SupportedIndexType) -> bool:
-        return self.get(item) is not None
+        return item in self._symbol_by_name
 
     def get(self, item: SupportedIndexType) -> Optional[Symbol]:
         return self.lookup_symbol_by_name_this_indentation(item)
@@ -81,11 +99,10 @@ class Scope:
     def non_namespace_parent_scope(self) -> Optional["Scope"]:
         # a scope nested inside of a namespace scope does not have access
         # to unqualified members of the namespace scope
-        if self.is_global:
-            return None
-        if self.parent_scope.is_namespace_scope:
-            return self.parent_scope.non_namespace_parent_scope
-        return self.parent_scope
+        scope = self.parent_scope
+        while scope is not None and scope.is_namespace_scope:
+            scope = scope.parent_scope
+        return scope
 
     def make_child_scope(self, scope_name) -> "Scope":
         symtab = tracer().cur_cell_symtab if self.is_global else self.symtab
@@ -116,10 +133,16 @@ class Scope:
     def lookup_symbol_by_name(
         self, name: SupportedIndexType, **kwargs: Any
     ) -> Optional[Symbol]:
-        ret = self.lookup_symbol_by_name_this_indentation(name, **kwargs)
-        if ret is None and self.non_namespace_parent_scope is not None:
-            ret = self.non_namespace_parent_scope.lookup_symbol_by_name(name, **kwargs)
-        return ret
+        scope: Optional[Scope] = self
+        while scope is not None:
+            ret = scope.lookup_symbol_by_name_this_indentation(name, **kwargs)
+            if ret is not None:
+                return ret
+            # inline non_namespace_parent_scope to skip the property call per level
+            scope = scope.parent_scope
+            while scope is not None and scope.is_namespace_scope:
+                scope = scope.parent_scope
+        return None
 
     def lookup_symbol_by_qualified_name(self, qualified_name: str) -> Optional[Symbol]:
         scope_or_sym: Union["Scope", Symbol] = self
@@ -143,20 +166,19 @@ class Scope:
         this can no longer be done semi-statically (e.g. because one of the
         chain members is a CallPoint).
         """
+        chain = symbol_ref.chain
+        next_atoms: Tuple[Optional[Atom], ...] = chain[1:] + (None,)
+        # same as Symbol.namespace, but resolve the registry once per chain
+        namespaces = flow().namespaces
         cur_scope = self
-        for i, atom in enumerate(symbol_ref.chain):
-            is_last = i == len(symbol_ref.chain) - 1
-            if atom.is_callpoint:
-                next_sym = cur_scope.lookup_symbol_by_name(atom.value)
-                if next_sym is not None:
-                    yield next_sym, atom, None if is_last else symbol_ref.chain[i + 1]
-                break
+        for atom, next_atom in zip(chain, next_atoms):
             next_sym = cur_scope.lookup_symbol_by_name(atom.value)
             if next_sym is None:
                 break
-            else:
-                yield next_sym, atom, None if is_last else symbol_ref.chain[i + 1]
-            cur_scope = next_sym.namespace
+            yield next_sym, atom, next_atom
+            if atom.is_callpoint:
+                break
+            cur_scope = namespaces.get(next_sym.obj_id)
             if cur_scope is None:
                 break
 
@@ -211,38 +233,53 @@ class Scope:
         else:
             return SymbolType.DEFAULT
 
+    def _compute_dead_symbol_refs(self, stmt_node: ast.stmt) -> Set[SymbolRef]:
+        # a single statement (e.g. a tuple assignment or multi-name import) can
+        # upsert many symbols, so share the analysis until the statement finishes
+        if not tracer_initialized():
+            return compute_live_dead_symbol_refs(stmt_node, self)[1]
+        dead_refs_by_id = tracer().node_id_to_dead_symbol_refs
+        cached = dead_refs_by_id.get(id(stmt_node))
+        if cached is not None and cached[0] is stmt_node:
+            return cached[1]
+        dead = compute_live_dead_symbol_refs(stmt_node, self)[1]
+        dead_refs_by_id[id(stmt_node)] = (stmt_node, dead)
+        return dead
+
     def _compute_is_static_write_for_assign(self, sym: Symbol) -> bool:
         if sym.symbol_node is None:
             return False
         try:
-            return (
-                SymbolRef(sym.symbol_node, scope=self).canonical()
-                in compute_live_dead_symbol_refs(sym.stmt_node, self)[1]
-            )
+            ref = SymbolRef(sym.symbol_node, scope=self).canonical()
+            return ref in self._compute_dead_symbol_refs(sym.stmt_node)
         except TypeError:
             return False
 
     def _compute_is_static_write_for_def(self, sym: Symbol) -> bool:
-        dead = compute_live_dead_symbol_refs(sym.stmt_node, self)[1]
-        return isinstance(sym.name, str) and SymbolRef.from_string(sym.name) in dead
+        if not isinstance(sym.name, str):
+            return False
+        dead = self._compute_dead_symbol_refs(sym.stmt_node)
+        return _symbol_ref_from_name(sym.name) in dead
 
     def _compute_is_static_write_for_import(self, sym: Symbol) -> bool:
         assert isinstance(sym.stmt_node, (ast.Import, ast.ImportFrom))
-        dead = compute_live_dead_symbol_refs(sym.stmt_node, self)[1]
+        dead = self._compute_dead_symbol_refs(sym.stmt_node)
         for import_name in sym.stmt_node.names:
             if (
                 import_name.name == "*"
-                or SymbolRef.from_string(import_name.asname or import_name.name)
+                or _symbol_ref_from_name(import_name.asname or import_name.name)
                 not in dead
             ):
                 return False
         return True
 
     def _compute_is_static_write(self, sym: Symbol) -> bool:
+        if sym.stmt_node is None:
+            return False
         scope = self
         while scope.is_namespace_scope:
             scope = scope.parent_scope
-        if not scope.is_global or sym.stmt_node is None:
+        if not scope.is_global:
             return False
         elif not pyc.is_outer_stmt(id(sym.stmt_node)):
             return False
@@ -286,9 +323,8 @@ class Scope:
             is_anonymous=is_anonymous,
             class_scope=class_scope,
         )
-        deps = set(
-            [] if deps is None else deps
-        )  # make a copy since we mutate it (see below fixme)
+        # make a copy since we mutate it (see below fixme)
+        deps = set() if deps is None else set(deps)
         sym, prev_sym, prev_obj = self._upsert_symbol_for_name_inner(
             name,
             obj,
@@ -308,13 +344,14 @@ class Scope:
         )
         if tracer_initialized():
             tracer().this_stmt_updated_symbols.add(sym)
-        if cells().exec_counter() <= 0:
+        cells_ = cells()
+        if cells_.exec_counter() <= 0:
             return sym
         try:
             is_static_write = self._compute_is_static_write(sym)
         except SyntaxError:
             is_static_write = False
-        current_cell = cells().current_cell()
+        current_cell = cells_.current_cell()
         for subsym in itertools.chain([sym], sym.get_namespace_symbols(recurse=True)):
             if is_static_write and subsym not in current_cell.dynamic_writes:
                 current_cell._pending_dynamic_writes.discard(subsym)
@@ -420,10 +457,6 @@ class Scope:
             self.is_namespace_scope and self.parent_scope.is_globally_accessible
         )
 
-    @property
-    def is_namespace_scope(self):
-        return False
-
     @property
     def namespace(self) -> Optional["Namespace"]:
         if self.is_namespace_scope:
@@ -433,33 +466,38 @@ class Scope:
 
     @property
     def global_scope(self):
-        if self.is_global:
-            return self
-        return self.parent_scope.global_scope
+        scope = self
+        while scope.parent_scope is not None:
+            scope = scope.parent_scope
+        return scope
 
     @property
     def full_path(self) -> Tuple[str, ...]:
-        path = (self.scope_name,)
-        if self.is_global:
-            return path
-        else:
-            return self.parent_scope.full_path + path
+        path = []
+        scope: Optional[Scope] = self
+        while scope is not None:
+            path.append(scope.scope_name)
+            scope = scope.parent_scope
+        path.reverse()
+        return tuple(path)
 
     @property
     def full_namespace_path(self) -> str:
-        if not self.is_namespace_scope:
-            return ""
-        if self.parent_scope is not None:
-            prefix = self.parent_scope.full_namespace_path
-        else:
-            prefix = ""
-        if prefix:
-            if self.scope_name.isdecimal() or getattr(self, "is_subscript", False):
-                return f"{prefix}[{self.scope_name}]"
+        containing_namespaces = []
+        scope: Optional[Scope] = self
+        while scope is not None and scope.is_namespace_scope:
+            containing_namespaces.append(scope)
+            scope = scope.parent_scope
+        parts: List[str] = []
+        for scope in reversed(containing_namespaces):
+            if not parts:
+                if scope.scope_name:
+                    parts.append(scope.scope_name)
+            elif scope.scope_name.isdecimal() or getattr(scope, "is_subscript", False):
+                parts.append(f"[{scope.scope_name}]")
             else:
-                return f"{prefix}.{self.scope_name}"
-        else:
-            return self.scope_name
+                parts.append(f".{scope.scope_name}")
+        return "".join(parts)
 
     def make_namespace_qualified_name(self, sym: Symbol) -> str:
         return str(sym.name)
@@ -33,7 +33,7 @@ from ipyflow.slicing.context import dynamic_slicing_context, slicing_context
 from ipyflow.slicing.mixin import FormatType, Slice
 from ipyflow.tracing.watchpoint import Watchpoints
 from ipyflow.types import IMMUTABLE_PRIMITIVE_TYPES, IdType, SupportedIndexType
-from ipyflow.utils.misc_utils import cleanup_discard, debounce
+from ipyflow.utils.misc_utils import cleanup_discard, debounce, setdefault_add
 
 try:
     from importlib.util import _LazyModule  # type: ignore
@@ -189,7 +189,7 @@ class Symbol:
         self._num_ipywidget_observers = 0
         self._num_mercury_widget_observers = 0
 
-        flow().aliases.setdefault(id(obj), set()).add(self)
+        setdefault_add(flow().aliases, id(obj), self)
         if (
             isinstance(self.name, str)
             and not self.is_anonymous
@@ -714,7 +714,7 @@ class Symbol:
 
     def _handle_aliases(self):
         cleanup_discard(flow().aliases, self.cached_obj_id, self)
-        flow().aliases.setdefault(self.obj_id, set()).add(self)
+        setdefault_add(flow().aliases, self.obj_id, self)
 
     def update_stmt_node(self, stmt_node: Optional[ast.stmt]) -> Optional[ast.stmt]:
         self.stmt_node = stmt_node
@@ -1325,7 +1325,7 @@ class Symbol:
                     containing_namespace._subscript_symbol_by_name[alias.name] = alias
             cleanup_discard(flow_.aliases, self.cached_obj_id, self)
             cleanup_discard(flow_.aliases, self.obj_id, self)
-            flow_.aliases.setdefault(id(obj), set()).add(self)
+            setdefault_add(flow_.aliases, id(obj), self)
             self.update_obj_ref(obj)
         elif self.obj_len != self.cached_obj_len:
             self._refresh_cached_obj()
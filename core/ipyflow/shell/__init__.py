@@ -6,6 +6,7 @@ from ipyflow.shell.interactiveshell import IPyflowInteractiveShell, UsesIPyflowS
 from ipyflow.shell.interactiveshellembed import IPyflowInteractiveShellEmbed, embed
 from ipyflow.shell.terminalinteractiveshell import IPyflowTerminalInteractiveShell
 from ipyflow.shell.zmqshell import IPyflowZMQInteractiveShell
+from ipyflow.utils.gc_utils import set_gc_thresholds
 
 if TYPE_CHECKING:
     from IPython import InteractiveShell
@@ -19,6 +20,11 @@ __all__ = [
 ]
 
 
+# the shell can be used without ever importing ipyflow.kernel (e.g. via
+# ipyflow.main() or the test runner), so relax gc thresholds here as well
+set_gc_thresholds()
+
+
 def load_ipython_extension(ipy: "InteractiveShell") -> None:
     cur_shell_cls = ipy.__class__  # type: ignore
     if issubclass(cur_shell_cls, IPyflowInteractiveShell):
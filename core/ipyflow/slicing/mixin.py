@@ -174,7 +174,7 @@ class Slice:
         arg_set_raw = {ref.ref.chain[0].value for ref in live_refs}
         arg_set = {arg for arg in arg_set_raw if isinstance(arg, str)}
         for arg in list(arg_set):
-            if hasattr(builtins, arg) or arg in sys.modules:
+            if arg in builtins.__dict__ or arg in sys.modules:
                 arg_set.discard(arg)
         args = list(arg_set)
         prepend_lines = ["import sys\n"]
@@ -71,7 +71,7 @@ def resolve_external_call(
         and caller_self is not None
         and not isinstance(caller_self, type)
     ):
-        for cls in caller_self.__class__.mro():
+        for cls in caller_self.__class__.__mro__:
             external_call_type = REGISTERED_HANDLER_BY_METHOD.get((cls, method))
             if external_call_type is not None:
                 module = getattr(cls, "__module__", module)
@@ -29,6 +29,10 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+# per handler class, the `initialize` methods run by _initialize_impl, in mro order
+_INITIALIZERS_BY_HANDLER_CLASS: Dict[type, Tuple[Callable[..., Any], ...]] = {}
+
+
 class HasGetitem(type):
     """
     Mixin for indicating that a class has a __getitem__ method
@@ -69,12 +73,22 @@ class ExternalCallHandler(metaclass=HasGetitem):
             calling_symbol=calling_symbol,
         )._initialize_impl(**kwargs)
 
+    @classmethod
+    def _get_initializers(cls) -> Tuple[Callable[..., Any], ...]:
+        initializers = _INITIALIZERS_BY_HANDLER_CLASS.get(cls)
+        if initializers is None:
+            initializer_list = []
+            for klass in cls.__mro__:
+                if not hasattr(klass, "initialize"):
+                    break
+                initializer_list.append(klass.initialize)  # type: ignore
+            initializers = _INITIALIZERS_BY_HANDLER_CLASS[cls] = tuple(initializer_list)
+        return initializers
+
     def _initialize_impl(self, **kwargs) -> "ExternalCallHandler":
         ret = self
-        for cls in self.__class__.mro():
-            if not hasattr(cls, "initialize"):
-                break
-            ret = cls.initialize(ret, **kwargs) or ret  # type: ignore
+        for initialize in self._get_initializers():
+            ret = initialize(ret, **kwargs) or ret
         return ret
 
     def initialize(self, **_) -> Optional["ExternalCallHandler"]:
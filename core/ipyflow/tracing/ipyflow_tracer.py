@@ -12,8 +12,11 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    ContextManager,
     Dict,
+    FrozenSet,
     Generator,
+    Iterable,
     List,
     Optional,
     Set,
@@ -26,7 +29,7 @@ import pyccolo as pyc
 from IPython import get_ipython
 
 from ipyflow.analysis.live_refs import compute_live_dead_symbol_refs
-from ipyflow.analysis.symbol_ref import resolve_slice_to_constant
+from ipyflow.analysis.symbol_ref import SymbolRef, resolve_slice_to_constant
 from ipyflow.annotations.compiler import compile_and_register_handlers_for_module
 from ipyflow.api.lift import code as api_code
 from ipyflow.api.lift import deps as api_deps
@@ -87,6 +90,55 @@ blocking_spec = pyc.AugmentationSpec(
 )
 
 
+_ATTRSUB_LOAD_EVENTS = frozenset((pyc.before_attribute_load, pyc.before_subscript_load))
+_ATTRSUB_STORE_EVENTS = frozenset(
+    (pyc.before_attribute_store, pyc.before_subscript_store)
+)
+_ATTRSUB_DEL_EVENTS = frozenset((pyc.before_attribute_del, pyc.before_subscript_del))
+
+# api functions whose first argument gets its usage info updated in
+# handle_lift_argument; any other callee lets that handler bail immediately
+_LIFT_API_FUNCTIONS = (
+    api_code,
+    api_deps,
+    api_has_tag,
+    api_lift,
+    api_rdeps,
+    api_rusers,
+    api_set_tag,
+    api_symbols,
+    api_timestamp,
+    api_unset_tag,
+    api_users,
+    api_watchpoints,
+)
+
+
+class _DataflowTracingDisabled:
+    """
+    Context manager behind DataflowTracer.dataflow_tracing_disabled. It wraps
+    every call to a tracing-disabled patched function, so it is a plain class
+    rather than a @contextmanager generator.
+    """
+
+    __slots__ = ("tracer", "was_tracing_enabled")
+
+    def __init__(self, tracer: "DataflowTracer") -> None:
+        self.tracer = tracer
+        self.was_tracing_enabled = False
+
+    def __enter__(self) -> None:
+        tracer = self.tracer
+        self.was_tracing_enabled = tracer.is_tracing_enabled
+        if self.was_tracing_enabled:
+            tracer._disable_tracing()
+
+    def __exit__(self, *_) -> None:
+        tracer = self.tracer
+        if self.was_tracing_enabled and not tracer.is_tracing_enabled:
+            tracer._enable_tracing()
+
+
 class ModuleIniter(pyc.BaseTracer):
     @pyc.register_raw_handler(pyc.init_module)
     def init_cell(self, _obj, _node_id, frame: FrameType, *_, **__):
@@ -119,22 +171,22 @@ class StackFrameManager(SingletonBaseTracer):
         *_,
         **__,
     ):
-        if frame.f_code.co_name == "<traced_lambda>":
+        code = frame.f_code
+        if code.co_name == "<traced_lambda>":
             return pyc.SkipAll
-        flow_ = flow()
         # IPython quirk -- every line in outer scope apparently wrapped in lambda
         # We want to skip the outer 'call' and 'return' for these
-        frame_filename = frame.f_code.co_filename
-        if event == pyc.call:
+        frame_filename = code.co_filename
+        if event is pyc.call:
             self.call_depth += 1
-            self.external_call_depth += not flow_.is_cell_file(
+            self.external_call_depth += not flow().is_cell_file(
                 frame_filename
             ) and not is_project_file(frame_filename)
             if self.call_depth == 1:
                 return pyc.SkipAll
-        elif event == pyc.return_:
+        elif event is pyc.return_:
             self.call_depth -= 1
-            self.external_call_depth -= not flow_.is_cell_file(
+            self.external_call_depth -= not flow().is_cell_file(
                 frame_filename
             ) and not is_project_file(frame_filename)
             self.call_depth = max(self.call_depth, 0)
@@ -152,13 +204,14 @@ class StackFrameManager(SingletonBaseTracer):
 
     @classmethod
     def get_user_call_stack_depth(cls, frame: FrameType) -> int:
-        flow_ = flow()
+        is_cell_file = flow().is_cell_file
+        is_filtered_path = cls._FILTERED_PATH_REGEX.search
         user_call_depth = 0
         while frame is not None:
             filename = frame.f_code.co_filename
-            if flow_.is_cell_file(filename) or (
+            if is_cell_file(filename) or (
                 not is_project_file(filename)
-                and not cls._FILTERED_PATH_REGEX.search(filename)
+                and not is_filtered_path(filename)
                 and "scripts/test_runner.py" not in filename
             ):
                 user_call_depth += 1
@@ -187,6 +240,7 @@ class DataflowTracer(StackFrameManager):
             self.blocking_node_ids: Set[int] = self.augmented_node_ids_by_spec[
                 blocking_spec
             ]
+            self.node_id_to_subscript_live_names: Dict[NodeId, FrozenSet[str]] = {}
         self.tracing_disabled_since_last_stmt = False
         self.tracing_disabled_since_last_module_stmt = False
         self.guards_pending_deactivation: Set[str] = set()
@@ -203,6 +257,9 @@ class DataflowTracer(StackFrameManager):
         self.node_id_to_saved_del_data: Dict[NodeId, SavedDelData] = {}
         self.node_id_to_loaded_literal_scope: Dict[NodeId, Namespace] = {}
         self.node_id_to_saved_dict_key: Dict[NodeId, Any] = {}
+        self.node_id_to_dead_symbol_refs: Dict[
+            NodeId, Tuple[ast.stmt, Set[SymbolRef]]
+        ] = {}
         self.this_stmt_updated_symbols: Set[Symbol] = set()
         self.pending_usage_updates_by_sym: Dict[Symbol, bool] = {}
         self.cur_cell_symtab: Optional[symtable.SymbolTable] = None
@@ -259,16 +316,8 @@ class DataflowTracer(StackFrameManager):
         except Exception:
             pass
 
-    @contextmanager
-    def dataflow_tracing_disabled(self) -> Generator[None, None, None]:
-        is_tracing_enabled = self.is_tracing_enabled
-        try:
-            if is_tracing_enabled:
-                self._disable_tracing()
-            yield
-        finally:
-            if is_tracing_enabled and not self.is_tracing_enabled:
-                self._enable_tracing()
+    def dataflow_tracing_disabled(self) -> ContextManager[None]:
+        return _DataflowTracingDisabled(self)
 
     def make_tracing_disabled_func(
         self,
@@ -304,6 +353,12 @@ class DataflowTracer(StackFrameManager):
         finally:
             setattr(obj, attr, orig_func)
 
+    # qualname prefixes of callees for which before_call disables tracing
+    _TRACING_DISABLED_QUALNAME_PREFIXES = (
+        dataflow_tracing_disabled_patch.__qualname__,
+        "InteractiveShell.",
+    )
+
     @property
     def syntax_augmentation_specs(self) -> List[pyc.AugmentationSpec]:
         return [blocking_spec, cascading_reactive_spec, reactive_spec]
@@ -327,6 +382,7 @@ class DataflowTracer(StackFrameManager):
         self.active_literal_scope = None
         self.node_id_to_loaded_literal_scope.clear()
         self.node_id_to_saved_dict_key.clear()
+        self.node_id_to_dead_symbol_refs.clear()
         self.prev_node_id_in_cur_frame = None
         self.saved_assign_rhs_obj = None
         flow().updated_symbols |= self.this_stmt_updated_symbols
@@ -665,20 +721,29 @@ class DataflowTracer(StackFrameManager):
         else:
             return []
 
-    def resolve_symbols(self, symbol_refs: Set[Union[str, int, Symbol]]) -> Set[Symbol]:
+    def resolve_symbols(
+        self, symbol_refs: Iterable[Union[str, int, Symbol]]
+    ) -> Set[Symbol]:
         symbols = set()
         for ref in symbol_refs:
             symbols.update(self.resolve_loaded_symbols(ref))
         return symbols
 
     def _get_namespace_for_obj(
-        self, obj: Any, obj_name: Optional[str] = None
+        self, obj: Any, obj_name: Optional[str] = None, obj_id: Optional[ObjId] = None
     ) -> Namespace:
-        obj_id = id(obj)
-        ns = flow().namespaces.get(obj_id)
-        if ns is not None:
-            return ns
-        class_scope = flow().namespaces.get(id(obj.__class__), None)
+        if obj_id is None:
+            obj_id = id(obj)
+        try:
+            return flow().namespaces[obj_id]
+        except KeyError:
+            return self._make_namespace_for_obj(obj, obj_id, obj_name)
+
+    def _make_namespace_for_obj(
+        self, obj: Any, obj_id: ObjId, obj_name: Optional[str]
+    ) -> Namespace:
+        flow_ = flow()
+        class_scope = flow_.namespaces.get(id(obj.__class__))
         if class_scope is not None:
             # logger.warning(
             #     'found class scope %s containing %s',
@@ -691,7 +756,7 @@ class DataflowTracer(StackFrameManager):
             # print('no scope for class', obj.__class__)
             try:
                 scope_name = (
-                    flow().get_first_full_symbol(obj_id).name
+                    flow_.get_first_full_symbol(obj_id).name
                     if obj_name is None
                     else obj_name
                 )
@@ -702,7 +767,7 @@ class DataflowTracer(StackFrameManager):
         frame = self.prev_trace_stmt_in_cur_frame.frame
         if ns.parent_scope is None and frame is not None:
             if obj_name is not None and obj_name not in frame.f_locals:
-                parent_scope = flow().global_scope
+                parent_scope = flow_.global_scope
             else:
                 parent_scope = self.active_scope
             ns.parent_scope = parent_scope
@@ -740,6 +805,7 @@ class DataflowTracer(StackFrameManager):
         up_to_component = ""
         symbol = None
         components = module_name.split(".")
+        aliases = flow().aliases
         for idx, component in enumerate(components):
             if is_first:
                 up_to_component = component
@@ -751,7 +817,8 @@ class DataflowTracer(StackFrameManager):
             sym_name = component
             if is_first and not is_named and not sym_name.startswith("<"):
                 sym_name = f"<{sym_name}>"
-            symbol = next(iter(flow().aliases.get(id(module), {None})))
+            module_aliases = aliases.get(id(module))
+            symbol = next(iter(module_aliases)) if module_aliases else None
             if symbol is None:
                 symbol = cur_scope.upsert_symbol_for_name(
                     sym_name,
@@ -876,19 +943,28 @@ class DataflowTracer(StackFrameManager):
     @pyc.register_raw_handler(pyc.after_subscript_slice)
     @pyc.skip_when_tracing_disabled
     def after_subscript_slice(self, _obj: Any, node_id: NodeId, *__, **___):
-        node = self.ast_node_by_id.get(node_id, None)
-        if node is None:
+        subscript_live_refs = self.node_id_to_subscript_live_names.get(node_id)
+        if subscript_live_refs is None:
+            node = self.ast_node_by_id.get(node_id, None)
+            if node is None:
+                return
+            slice_node = cast(ast.Subscript, node).slice
+            live, *_ = compute_live_dead_symbol_refs(
+                slice_node, scope=self.cur_frame_original_scope
+            )
+            subscript_live_refs = frozenset(
+                cast(str, ref.ref.chain[0].value)
+                for ref in live
+                if len(ref.ref.chain) == 1
+            )
+            # the live names of a slice are purely syntactic, so they
+            # only need computing once per node, not once per execution
+            self.node_id_to_subscript_live_names[node_id] = subscript_live_refs
+        if not subscript_live_refs:
+            # nothing to resolve for constant slices such as `x[0]` or `d["k"]`
             return
-        slice_node = cast(ast.Subscript, node).slice
-        live, *_ = compute_live_dead_symbol_refs(
-            slice_node, scope=self.cur_frame_original_scope
-        )
-        subscript_live_refs = []
-        for ref in live:
-            if len(ref.ref.chain) == 1:
-                subscript_live_refs.append(cast(str, ref.ref.chain[0].value))
         self.node_id_to_saved_live_subscript_refs[node_id] = self.resolve_symbols(
-            set(subscript_live_refs)
+            subscript_live_refs
         )
         Timestamp.update_usage_info(
             self.cur_frame_original_scope.lookup_symbol_by_name(ref)
@@ -919,10 +995,10 @@ class DataflowTracer(StackFrameManager):
         obj_name: Optional[str] = None,
         **__,
     ):
-        value_node_id = id(node.value)
-        if isinstance(self.ast_node_by_id[value_node_id], ast.Call):
+        value_node = node.value
+        if isinstance(value_node, ast.Call):
             # clear the callpoint dependency
-            self.node_id_to_loaded_symbols.pop(value_node_id, None)
+            self.node_id_to_loaded_symbols.pop(id(value_node), None)
         if obj is None or obj is get_ipython():
             return
         logger.warning("%s %s of obj %s", event, attr_or_subscript, obj)
@@ -934,8 +1010,9 @@ class DataflowTracer(StackFrameManager):
         if sym_for_obj is None and obj_name is not None:
             sym_for_obj = self.active_scope.get(obj_name)
 
-        scope = self._get_namespace_for_obj(obj, obj_name=obj_name)
-        is_subscript = "subscript" in event.value
+        obj_id = id(obj)
+        scope = self._get_namespace_for_obj(obj, obj_name=obj_name, obj_id=obj_id)
+        is_subscript = isinstance(node, ast.Subscript)
         if sym_for_obj is not None and sym_for_obj.obj is obj:
             try:
                 sym = scope.lookup_symbol_by_name_this_indentation(
@@ -945,38 +1022,34 @@ class DataflowTracer(StackFrameManager):
                 )
             except TypeError:
                 sym = None
-            if call_context or event not in (
-                pyc.before_attribute_load,
-                pyc.before_subscript_load,
-            ):
-                self.pending_usage_updates_by_sym[sym_for_obj] = (
-                    self.pending_usage_updates_by_sym.get(sym_for_obj, True)
+            pending_usage_updates = self.pending_usage_updates_by_sym
+            is_load = event in _ATTRSUB_LOAD_EVENTS
+            if call_context or not is_load:
+                pending_usage_updates[sym_for_obj] = (
+                    pending_usage_updates.get(sym_for_obj, True)
                     and (sym is not None)
                     and not call_context
                 )
-            if sym is not None and event in (
-                pyc.before_attribute_load,
-                pyc.before_subscript_load,
-            ):
-                self.pending_usage_updates_by_sym.setdefault(sym, True)
+            if sym is not None and is_load:
+                pending_usage_updates.setdefault(sym, True)
 
-        obj_id = id(obj)
         if self.top_level_node_id_for_chain is None:
             self.top_level_node_id_for_chain = top_level_node_id
         if self.first_obj_id_in_chain is None:
             self.first_obj_id_in_chain = obj_id
 
         try:
-            if isinstance(attr_or_subscript, list):
-                attr_or_subscript = tuple(attr_or_subscript)
-            if isinstance(attr_or_subscript, tuple):
-                if not all(
-                    isinstance(v, SubscriptIndices.types) for v in attr_or_subscript
-                ):
+            # attribute names are always strings; only subscripts need validating
+            if is_subscript:
+                index_types = SubscriptIndices.types
+                if isinstance(attr_or_subscript, list):
+                    attr_or_subscript = tuple(attr_or_subscript)
+                if isinstance(attr_or_subscript, tuple):
+                    if not all(isinstance(v, index_types) for v in attr_or_subscript):
+                        return
+                elif not isinstance(attr_or_subscript, index_types):
                     return
-            elif not isinstance(attr_or_subscript, SubscriptIndices.types):
-                return
-            if "store" in event.value:
+            if event in _ATTRSUB_STORE_EVENTS:
                 logger.warning(
                     "save store data for node id %d: %s, %s, %s, %s",
                     top_level_node_id,
@@ -992,7 +1065,7 @@ class DataflowTracer(StackFrameManager):
                     is_subscript,
                 )
                 return
-            elif "del" in event.value:
+            elif event in _ATTRSUB_DEL_EVENTS:
                 # logger.error("save del data for node %s", ast.dump(self.ast_node_by_id[top_level_node_id]))
                 logger.warning("save del data for node id %d", top_level_node_id)
                 self.node_id_to_saved_del_data[top_level_node_id] = (
@@ -1027,7 +1100,7 @@ class DataflowTracer(StackFrameManager):
                         and self.prev_trace_stmt_in_cur_frame is not None
                     ):
                         sym_for_obj = self.active_scope.upsert_symbol_for_name(
-                            obj_name or "<anonymous_symbol_%d>" % id(obj),
+                            obj_name or "<anonymous_symbol_%d>" % obj_id,
                             obj,
                             set(),
                             self.prev_trace_stmt_in_cur_frame.stmt_node,
@@ -1069,20 +1142,7 @@ class DataflowTracer(StackFrameManager):
     @pyc.register_handler(pyc.after_argument)
     @pyc.skip_when_tracing_disabled
     def handle_lift_argument(self, arg_obj: Any, arg_node: ast.AST, *_, **__):
-        if self.num_args_seen > 0 or self.cur_function not in (
-            api_code,
-            api_deps,
-            api_has_tag,
-            api_lift,
-            api_rdeps,
-            api_rusers,
-            api_set_tag,
-            api_symbols,
-            api_timestamp,
-            api_unset_tag,
-            api_users,
-            api_watchpoints,
-        ):
+        if self.num_args_seen > 0 or self.cur_function not in _LIFT_API_FUNCTIONS:
             return
         resolved = [
             sym
@@ -1177,7 +1237,7 @@ class DataflowTracer(StackFrameManager):
         self, function_or_method, node: ast.Call, frame: FrameType, *_, **__
     ):
         if getattr(function_or_method, "__qualname__", "").startswith(
-            (self.dataflow_tracing_disabled_patch.__qualname__, "InteractiveShell.")
+            self._TRACING_DISABLED_QUALNAME_PREFIXES
         ):
             self._tracked_disable_tracing(frame)
             return
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import ast
+import sys
 from typing import NamedTuple, Optional
 
 from pyccolo._fast.misc_ast_utils import subscript_to_slice  # noqa: F401
@@ -11,11 +12,25 @@ class AstRange(NamedTuple):
     col_offset: int
     end_col_offset: Optional[int]
 
-    @classmethod
-    def from_ast_node(cls, node: ast.AST) -> "AstRange":
-        return cls(
-            lineno=node.lineno,
-            end_lineno=getattr(node, "end_lineno", None),
-            col_offset=node.col_offset,
-            end_col_offset=getattr(node, "end_col_offset", None),
-        )
+    if sys.version_info >= (3, 8):
+
+        @classmethod
+        def from_ast_node(cls, node: ast.AST) -> "AstRange":
+            # end positions are optional node attributes that default to None
+            return cls(
+                node.lineno,
+                node.end_lineno,  # type: ignore[attr-defined]
+                node.col_offset,
+                node.end_col_offset,  # type: ignore[attr-defined]
+            )
+
+    else:  # pragma: no cover
+
+        @classmethod
+        def from_ast_node(cls, node: ast.AST) -> "AstRange":
+            return cls(
+                lineno=node.lineno,
+                end_lineno=getattr(node, "end_lineno", None),
+                col_offset=node.col_offset,
+                end_col_offset=getattr(node, "end_col_offset", None),
+            )
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import functools
 import re
 from threading import Timer
 from typing import Callable
@@ -9,8 +10,17 @@ class KeyDict(dict):
         return key
 
 
+def setdefault_add(d, key, val):
+    s = d.get(key)
+    if s is None:
+        s = d[key] = set()
+    s.add(val)
+
+
 def cleanup_discard(d, key, val):
-    s = d.get(key, set())
+    s = d.get(key)
+    if s is None:
+        return
     s.discard(val)
     if len(s) == 0:
         d.pop(key, None)
@@ -56,5 +66,7 @@ def yield_in_loop(*gens):
 _PROJECT_FILE_REGEX = re.compile(r"[/\\](ipyflow|pyccolo)[/\\]")
 
 
+# called for every frame on call / return events, which mostly repeat filenames
+@functools.lru_cache(maxsize=1024)
 def is_project_file(filename: str) -> bool:
     return bool(_PROJECT_FILE_REGEX.search(filename))
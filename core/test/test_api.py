@@ -87,3 +87,12 @@ def test_tags():
     run_cell("unset_tag(y, 'foo')")
     run_cell("assert not has_tag(x, 'foo')")
     run_cell("assert not has_tag(y, 'foo')")
+
+
+def test_toplevel_exports_cover_api():
+    import ipyflow
+    import ipyflow.api
+
+    assert set(ipyflow.api.__all__) <= set(ipyflow.__all__)
+    for name in ipyflow.api.__all__:
+        assert getattr(ipyflow, name) is getattr(ipyflow.api, name)
@@ -104,6 +104,12 @@ if sys.version_info >= (3, 8):
         cell_id, cells_run = run_cell("$y = 99")
         assert cells_run - {cell_id} == {3}, "got %s" % cells_run
 
+    def test_blocked_var_load_in_reactively_called_function():
+        assert run_cell("x = 0")[1] == {1}
+        assert run_cell("def f(): return $:x")[1] == {2}
+        assert run_cell("logging.info($f())")[1] == {3}
+        assert run_cell("x = 42")[1] == {4}
+
     def test_reactive_function_defn():
         assert run_cell("x = 0")[1] == {1}
         assert run_cell("def f(): return x")[1] == {2}